@@ -41,9 +41,11 @@ def main():
     tableau_auth = TSC.TableauAuth(args.username, password, args.site)
     server = TSC.Server(args.server, use_server_version=True)
     with server.auth.sign_in(tableau_auth):
-        views = filter(lambda x: x.id == args.resource_id,
-                       TSC.Pager(server.views.get))
-        view = views.pop()
+        # stop paging through the views as soon as the one we want turns up
+        view = next((x for x in TSC.Pager(server.views.get) if x.id == args.resource_id), None)
+        if view is None:
+            print("View not found: {}".format(args.resource_id))
+            return
 
         # We have a number of different types and functions for each different export type.
         # We encode that information above in the const=(...) parameter to the add_argument function to make
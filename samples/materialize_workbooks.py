@@ -1,9 +1,34 @@
 import argparse
 import getpass
+import io
 import logging
 import os
+import requests
 import tableauserverclient as TSC
-from collections import defaultdict
+from tableauserverclient.server.endpoint.exceptions import InternalServerError
+from collections import defaultdict, OrderedDict
+from functools import partial
+from multiprocessing.pool import ThreadPool
+
+# number of requests sent to the server at the same time
+MAX_WORKERS = 8
+
+# number of names sent in a single name filter
+NAME_FILTER_CHUNK_SIZE = 50
+
+# largest page size the server accepts, so filtered queries usually come back in a single page
+MAX_PAGE_SIZE = 1000
+
+# above this many names, filtering by name takes at least as many requests (one per chunk of names)
+# as paging through a site with 10000 workbooks at the largest page size, so all the workbooks are listed instead
+MAX_FILTERED_NAMES = 500
+
+# characters that are part of the filter syntax, or that requests leaves unescaped in the query string
+# so the server would read them as a query separator, a fragment, a space or an escape sequence
+FILTER_UNSAFE_CHARACTERS = frozenset(',:[]&#+%;=')
+
+# materialized views modes that can only be set on a site
+SITE_ONLY_MODES = frozenset(['enable_all', 'enable_selective'])
 
 
 def main():
@@ -73,25 +98,42 @@ def main():
         show_materialized_views_status(args, password, site_content_url)
 
 
-def find_project_path(project, all_projects, path):
-    # project stores the id of it's parent
-    # this method is to run recursively to find the path from root project to given project
-    path = project.name if len(path) == 0 else project.name + '/' + path
+def get_project_paths(all_projects, projects):
+    project_paths = build_project_path_index(all_projects)
+    result = dict()
+    for project in projects:
+        result[project_paths[project.id]] = project
+    return result
 
-    if project.parent_id is None:
-        return path
-    else:
-        return find_project_path(all_projects[project.parent_id], all_projects, path)
 
+def index_children_projects(all_projects):
+    # group the projects by their parent once instead of searching all projects for the children of every project
+    children_projects = defaultdict(list)
+    for project in all_projects.values():
+        children_projects[project.parent_id].append(project)
+    return children_projects
 
-def get_project_paths(server, projects):
-    # most likely user won't have too many projects so we store them in a dict to search
-    all_projects = {project.id: project for project in TSC.Pager(server.projects)}
 
-    result = dict()
-    for project in projects:
-        result[find_project_path(project, all_projects, "")] = project
-    return result
+def build_project_path_index(all_projects):
+    # find the path of every project in one walk down from the top level projects
+    children_projects = index_children_projects(all_projects)
+    project_paths = dict()
+    projects_to_visit = [(project, project.name) for project in children_projects[None]]
+    while projects_to_visit:
+        project, path = projects_to_visit.pop()
+        project_paths[project.id] = path
+        projects_to_visit.extend((child, path + '/' + child.name) for child in children_projects[project.id])
+    return project_paths
+
+
+def map_concurrently(function, items):
+    # multiprocessing's thread pool is used because concurrent.futures is not available on Python 2.7
+    pool = ThreadPool(MAX_WORKERS)
+    try:
+        return pool.map(function, items)
+    finally:
+        pool.close()
+        pool.join()
 
 
 def print_paths(paths):
@@ -99,30 +141,63 @@ def print_paths(paths):
         print(path)
 
 
+def print_updated_workbooks(workbook_names):
+    # write the results out at once rather than with a print call per workbook
+    lines = ["Updated materialized views settings for workbook: {}".format(workbook_name)
+             for workbook_name in workbook_names]
+    if lines:
+        print('\n'.join(lines))
+
+
 def show_materialized_views_status(args, password, site_content_url):
     tableau_auth = TSC.TableauAuth(args.username, password, site_id=site_content_url)
     server = TSC.Server(args.server, use_server_version=True)
-    enabled_sites = set()
+    enabled_sites = dict()
     with server.auth.sign_in(tableau_auth):
         # For server admin, this will prints all the materialized views enabled sites
         # For other users, this only prints the status of the site they belong to
         print("Materialized views is enabled on sites:")
         # only server admins can get all the sites in the server
         # other users can only get the site they are in
-        for site in TSC.Pager(server.sites):
+        # when a site is given only that site is looked up instead of paging through all the sites
+        if site_content_url:
+            sites = [server.sites.get_by_content_url(site_content_url)]
+        else:
+            sites = TSC.Pager(server.sites)
+        for site in sites:
             if site.materialized_views_mode != "disable":
-                enabled_sites.add(site)
+                enabled_sites[site.id] = site
                 print("Site name: {}".format(site.name))
         print('\n')
 
-    print("Materialized views is enabled on workbooks:")
-    # Individual workbooks can be enabled only when the sites they belong to are enabled too
-    for site in enabled_sites:
-        site_auth = TSC.TableauAuth(args.username, password, site.content_url)
-        with server.auth.sign_in(site_auth):
-            for workbook in TSC.Pager(server.workbooks):
-                if workbook.materialized_views_config['materialized_views_enabled']:
-                    print("Workbook: {} from site: {}".format(workbook.name, site.name))
+        print("Materialized views is enabled on workbooks:")
+        # Individual workbooks can be enabled only when the sites they belong to are enabled too
+        # every other site needs its own sign in, so the sites are listed concurrently
+        all_enabled_workbooks = map_concurrently(partial(get_materialized_views_enabled_workbooks,
+                                                         args, password, server, site_content_url),
+                                                 enabled_sites.values())
+        for site, enabled_workbooks in zip(enabled_sites.values(), all_enabled_workbooks):
+            for workbook in enabled_workbooks:
+                print("Workbook: {} from site: {}".format(workbook.name, site.name))
+
+
+def get_materialized_views_enabled_workbooks(args, password, server, site_content_url, site):
+    # the server we are signed in with can list the workbooks of its own site without signing in again
+    if site.content_url == site_content_url:
+        return filter_materialized_views_enabled_workbooks(server)
+
+    # a server object only holds one auth token, so other sites sign in with a server object of their own
+    # which reuses the version already looked up instead of asking the server again
+    site_server = TSC.Server(args.server)
+    site_server.version = server.version
+    site_auth = TSC.TableauAuth(args.username, password, site.content_url)
+    with site_server.auth.sign_in(site_auth):
+        return filter_materialized_views_enabled_workbooks(site_server)
+
+
+def filter_materialized_views_enabled_workbooks(server):
+    return [workbook for workbook in TSC.Pager(server.workbooks)
+            if workbook.materialized_views_config['materialized_views_enabled']]
 
 
 def update_project_by_path(args, materialized_views_config, password, site_content_url):
@@ -135,12 +210,14 @@ def update_project_by_path(args, materialized_views_config, password, site_conte
     with server.auth.sign_in(tableau_auth):
         if not assert_site_enabled_for_materialized_views(server, site_content_url):
             return False
-        projects = [project for project in TSC.Pager(server.projects) if project.name == project_name]
+        # most likely user won't have too many projects so we store them in a dict to search
+        all_projects = {project.id: project for project in TSC.Pager(server.projects)}
+        projects = [project for project in all_projects.values() if project.name == project_name]
         if not assert_project_valid(args.project_path, projects):
             return False
 
-        possible_paths = get_project_paths(server, projects)
-        update_project(possible_paths[args.project_path], server, materialized_views_config)
+        possible_paths = get_project_paths(all_projects, projects)
+        update_project(possible_paths[args.project_path], all_projects, server, materialized_views_config)
     return True
 
 
@@ -153,49 +230,87 @@ def update_project_by_name(args, materialized_views_config, password, site_conte
     with server.auth.sign_in(tableau_auth):
         if not assert_site_enabled_for_materialized_views(server, site_content_url):
             return False
+        all_projects = {project.id: project for project in TSC.Pager(server.projects)}
         # get all projects with given name
-        projects = [project for project in TSC.Pager(server.projects) if project.name == args.project_name]
+        projects = [project for project in all_projects.values() if project.name == args.project_name]
         if not assert_project_valid(args.project_name, projects):
             return False
 
         if len(projects) > 1:
-            possible_paths = get_project_paths(server, projects)
+            possible_paths = get_project_paths(all_projects, projects)
             print("Project name is not unique, use '--project_path <path>'")
             print("Possible project paths:")
             print_paths(possible_paths)
             print('\n')
             return False
         else:
-            update_project(projects[0], server, materialized_views_config)
+            update_project(projects[0], all_projects, server, materialized_views_config)
     return True
 
 
-def update_project(project, server, materialized_views_config):
-    all_projects = list(TSC.Pager(server.projects))
-    project_ids = find_project_ids_to_update(all_projects, project)
-    for workbook in TSC.Pager(server.workbooks):
-        if workbook.project_id in project_ids:
-            workbook.materialized_views_config = materialized_views_config
-            server.workbooks.update(workbook)
+def update_project(project, all_projects, server, materialized_views_config):
+    project_ids = find_project_ids_to_update(index_children_projects(all_projects), project)
+    workbooks = get_workbooks_in_projects(server, all_projects, project_ids)
+    update_workbooks(server, workbooks, materialized_views_config)
 
     print("Updated materialized views settings for project: {}".format(project.name))
     print('\n')
 
 
-def find_project_ids_to_update(all_projects, project):
+def get_workbooks_in_projects(server, all_projects, project_ids):
+    # only ask the server for workbooks in projects with the names of the given ones,
+    # project names are not unique so the project ids are still checked
+    project_names = sorted(set(all_projects[project_id].name for project_id in project_ids))
+    if len(project_names) > MAX_FILTERED_NAMES or not can_filter_by(project_names):
+        workbooks = get_all_workbooks(server)
+    else:
+        workbooks = get_workbooks_in(server, TSC.RequestOptions.Field.ProjectName, project_names)
+    return [workbook for workbook in workbooks if workbook.project_id in project_ids]
+
+
+def update_workbooks(server, workbooks, materialized_views_config):
+    # every workbook is updated with a request of its own, so the requests are sent concurrently
+    # a failed update is reported without stopping the others, and only the updated workbooks are returned
+    for workbook in workbooks:
+        workbook.materialized_views_config = materialized_views_config
+    errors = map_concurrently(partial(try_update_workbook, server), workbooks)
+
+    updated_workbooks = []
+    for workbook, error in zip(workbooks, errors):
+        if error is None:
+            updated_workbooks.append(workbook)
+        else:
+            print("Failed to update materialized views settings for workbook: {} ({})".format(workbook.name, error))
+    return updated_workbooks
+
+
+def try_update_workbook(server, workbook):
+    # describe why an update failed instead of raising, so the results of the other updates are not lost
+    try:
+        server.workbooks.update(workbook)
+    except TSC.ServerResponseError as error:
+        return "{}: {}".format(error.code, error.summary)
+    except InternalServerError as error:
+        return "{}: internal server error".format(error.code)
+    except requests.exceptions.RequestException as error:
+        return str(error)
+    return None
+
+
+def find_project_ids_to_update(children_projects, project):
     projects_to_update = []
-    find_projects_to_update(project, all_projects, projects_to_update)
+    find_projects_to_update(project, children_projects, projects_to_update)
     return set([project_to_update.id for project_to_update in projects_to_update])
 
 
 def parse_workbook_path(file_path):
     # parse the list of project path of workbooks
-    workbook_paths = sanitize_workbook_list(file_path, "path")
+    workbook_paths = sanitize_workbook_list(file_path)
 
     workbook_path_mapping = defaultdict(list)
     for workbook_path in workbook_paths:
-        workbook_project = workbook_path.rstrip().split('/')
-        workbook_path_mapping[workbook_project[-1]].append('/'.join(workbook_project[:-1]))
+        project_path, _, workbook_name = workbook_path.rpartition('/')
+        workbook_path_mapping[workbook_name].append(project_path)
     return workbook_path_mapping
 
 
@@ -212,49 +327,90 @@ def update_workbook(args, materialized_views_config, password, site_content_url)
         if args.path_list is not None:
             workbook_path_mapping = parse_workbook_path(args.path_list)
             all_projects = {project.id: project for project in TSC.Pager(server.projects)}
-            update_workbooks_by_paths(all_projects, materialized_views_config, server, workbook_path_mapping)
+            project_paths = build_project_path_index(all_projects)
+            update_workbooks_by_paths(project_paths, materialized_views_config, server, workbook_path_mapping)
         elif args.name_list is not None:
             update_workbooks_by_names(args.name_list, server, materialized_views_config)
     return True
 
 
-def update_workbooks_by_paths(all_projects, materialized_views_config, server, workbook_path_mapping):
-    for workbook_name, workbook_paths in workbook_path_mapping.items():
-        req_option = TSC.RequestOptions()
-        req_option.filter.add(TSC.Filter(TSC.RequestOptions.Field.Name,
-                                         TSC.RequestOptions.Operator.Equals,
-                                         workbook_name))
-        workbooks = list(TSC.Pager(server.workbooks, req_option))
-        all_paths = set(workbook_paths[:])
+def get_workbooks_by_names(server, workbook_names):
+    # group the workbooks by name rather than sending a separate filtered query for every name
+    workbook_names = set(workbook_names)
+    # names that cannot be sent in a filter, or too many names, are found by paging through all the workbooks
+    if len(workbook_names) > MAX_FILTERED_NAMES or not can_filter_by(workbook_names):
+        workbooks = get_all_workbooks(server)
+    else:
+        workbooks = get_workbooks_in(server, TSC.RequestOptions.Field.Name, sorted(workbook_names))
+
+    workbooks_by_name = defaultdict(list)
+    for workbook in workbooks:
+        if workbook.name in workbook_names:
+            workbooks_by_name[workbook.name].append(workbook)
+    return workbooks_by_name
+
+
+def can_filter_by(values):
+    # one value the server cannot read back would spoil the filter for every other value sent with it
+    return not any(FILTER_UNSAFE_CHARACTERS.intersection(value) for value in values)
+
+
+def get_all_workbooks(server):
+    # page through the workbooks with the largest page size to keep the number of requests down on big sites
+    return TSC.Pager(server.workbooks, TSC.RequestOptions(pagesize=MAX_PAGE_SIZE))
+
+
+def get_workbooks_in(server, field, names):
+    # query the workbooks for a chunk of names at a time so the filter stays within url length limits
+    # every chunk is paged through before the next one, so the same request options can be reused
+    req_option = TSC.RequestOptions(pagesize=MAX_PAGE_SIZE)
+    for start in range(0, len(names), NAME_FILTER_CHUNK_SIZE):
+        req_option.filter.clear()
+        req_option.filter.add(TSC.Filter(field,
+                                         TSC.RequestOptions.Operator.In,
+                                         names[start:start + NAME_FILTER_CHUNK_SIZE]))
+        for workbook in TSC.Pager(server.workbooks, req_option):
+            yield workbook
+
+
+def update_workbooks_by_paths(project_paths, materialized_views_config, server, workbook_path_mapping):
+    workbooks_by_name = get_workbooks_by_names(server, workbook_path_mapping.keys())
+    # index the workbooks by name and project path so every requested path is a single lookup
+    workbooks_by_path = dict()
+    for workbook_name, workbooks in workbooks_by_name.items():
         for workbook in workbooks:
-            path = find_project_path(all_projects[workbook.project_id], all_projects, "")
-            if path in workbook_paths:
-                all_paths.remove(path)
-                workbook.materialized_views_config = materialized_views_config
-                server.workbooks.update(workbook)
-                print("Updated materialized views settings for workbook: {}".format(path + '/' + workbook.name))
-
-        for path in all_paths:
-            print("Cannot find workbook path: {}, each line should only contain one workbook path"
-                  .format(path + '/' + workbook_name))
+            workbooks_by_path[(workbook_name, project_paths.get(workbook.project_id))] = workbook
+
+    workbooks_to_update = []
+    for workbook_name, workbook_paths in workbook_path_mapping.items():
+        for path in set(workbook_paths):
+            workbook = workbooks_by_path.get((workbook_name, path))
+            if workbook is None:
+                print("Cannot find workbook path: {}, each line should only contain one workbook path"
+                      .format(path + '/' + workbook_name))
+            else:
+                workbooks_to_update.append(workbook)
+
+    updated_workbooks = update_workbooks(server, workbooks_to_update, materialized_views_config)
+    print_updated_workbooks([project_paths[workbook.project_id] + '/' + workbook.name
+                             for workbook in updated_workbooks])
     print('\n')
 
 
 def update_workbooks_by_names(name_list, server, materialized_views_config):
-    workbook_names = sanitize_workbook_list(name_list, "name")
+    # a name listed more than once is only looked up and updated once, in the order of the file
+    workbook_names = list(OrderedDict.fromkeys(sanitize_workbook_list(name_list)))
+    workbooks_by_name = get_workbooks_by_names(server, workbook_names)
+    workbooks_to_update = []
     for workbook_name in workbook_names:
-        req_option = TSC.RequestOptions()
-        req_option.filter.add(TSC.Filter(TSC.RequestOptions.Field.Name,
-                                         TSC.RequestOptions.Operator.Equals,
-                                         workbook_name.rstrip()))
-        workbooks = list(TSC.Pager(server.workbooks, req_option))
+        workbooks = workbooks_by_name.get(workbook_name, [])
         if len(workbooks) == 0:
             print("Cannot find workbook name: {}, each line should only contain one workbook name"
                   .format(workbook_name))
-        for workbook in workbooks:
-            workbook.materialized_views_config = materialized_views_config
-            server.workbooks.update(workbook)
-            print("Updated materialized views settings for workbook: {}".format(workbook.name))
+        workbooks_to_update.extend(workbooks)
+
+    updated_workbooks = update_workbooks(server, workbooks_to_update, materialized_views_config)
+    print_updated_workbooks([workbook.name for workbook in updated_workbooks])
     print('\n')
 
 
@@ -276,7 +432,8 @@ def update_site(args, password, site_content_url):
 def create_materialized_views_config(args):
     materialized_views_config = dict()
     materialized_views_config['materialized_views_enabled'] = args.mode == "enable"
-    materialized_views_config['run_materialization_now'] = True if args.materialize_now else False
+    # store_true already parses the flag into a bool
+    materialized_views_config['run_materialization_now'] = args.materialize_now
     return materialized_views_config
 
 
@@ -291,7 +448,7 @@ def assert_site_options_valid(args):
 
 
 def assert_options_valid(args):
-    if args.type != "site" and args.mode in ("enable_all", "enable_selective"):
+    if args.type != "site" and args.mode in SITE_ONLY_MODES:
         print('"enable_all" and "enable_selective" do not apply to workbook/project type')
         return False
     if (args.type is None) != (args.mode is None):
@@ -315,27 +472,22 @@ def assert_project_valid(project_name, projects):
     return True
 
 
-def find_projects_to_update(project, all_projects, projects_to_update):
-    # Use recursion to find all the sub-projects and enable/disable the workbooks in them
-    projects_to_update.append(project)
-    children_projects = [child for child in all_projects if child.parent_id == project.id]
-    if len(children_projects) == 0:
-        return
-
-    for child in children_projects:
-        find_projects_to_update(child, all_projects, projects_to_update)
+def find_projects_to_update(project, children_projects, projects_to_update):
+    # Walk down from the given project to find all the sub-projects and enable/disable the workbooks in them
+    projects_to_visit = [project]
+    while projects_to_visit:
+        project = projects_to_visit.pop()
+        projects_to_update.append(project)
+        projects_to_visit.extend(children_projects.get(project.id, []))
 
 
-def sanitize_workbook_list(file_name, file_type):
+def sanitize_workbook_list(file_name):
     if not os.path.isfile(file_name):
         print("Invalid file name '{}'".format(file_name))
         return []
-    file_list = open(file_name, "r")
-
-    if file_type == "name":
-        return [workbook.rstrip() for workbook in file_list if not workbook.isspace()]
-    if file_type == "path":
-        return [workbook.rstrip() for workbook in file_list if not workbook.isspace()]
+    # read the names as text so they compare equal to the names the server returns, also on Python 2
+    with io.open(file_name, encoding='utf-8') as file_list:
+        return [workbook.rstrip() for workbook in file_list if workbook.strip()]
 
 
 if __name__ == "__main__":
@@ -13,7 +13,8 @@ import tableauserverclient as TSC
 
 
 def handle_run(server, args):
-    task = server.tasks.get_by_id(args.id)
+    # running a task only needs its id, so skip fetching the task from the server first
+    task = TSC.TaskItem(args.id, None, None)
     print(server.tasks.run(task))
 
 
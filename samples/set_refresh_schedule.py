@@ -42,10 +42,14 @@ def get_datasource_by_name(server, name):
     return datasources.pop()
 
 
-def get_schedule_by_name(server, name):
-    schedules = [x for x in TSC.Pager(server.schedules) if x.name == name]
-    assert len(schedules) == 1
-    return schedules.pop()
+def get_schedules_by_name(server):
+    # schedule names are unique on a server, so one pass gives a lookup for any number of names
+    return {x.name: x for x in TSC.Pager(server.schedules)}
+
+
+def get_schedule_by_name(schedules_by_name, name):
+    assert name in schedules_by_name
+    return schedules_by_name[name]
 
 
 def assign_to_schedule(server, workbook_or_datasource, schedule):
@@ -70,7 +74,8 @@ def run(args):
             item = get_workbook_by_name(server, args.workbook)
         else:
             item = get_datasource_by_name(server, args.datasource)
-        schedule = get_schedule_by_name(server, args.schedule)
+        schedules_by_name = get_schedules_by_name(server)
+        schedule = get_schedule_by_name(schedules_by_name, args.schedule)
 
         assign_to_schedule(server, item, schedule)
 
@@ -21,7 +21,10 @@ class PaginationItem(object):
 
     @classmethod
     def from_response(cls, resp, ns):
-        parsed_response = ET.fromstring(resp)
+        return cls.from_xml_element(ET.fromstring(resp), ns)
+
+    @classmethod
+    def from_xml_element(cls, parsed_response, ns):
         pagination_xml = parsed_response.find('t:pagination', namespaces=ns)
         pagination_item = cls()
         if pagination_xml is not None:
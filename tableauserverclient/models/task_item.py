@@ -17,7 +17,10 @@ class TaskItem(object):
 
     @classmethod
     def from_response(cls, xml, ns):
-        parsed_response = ET.fromstring(xml)
+        return cls.from_xml_element(ET.fromstring(xml), ns)
+
+    @classmethod
+    def from_xml_element(cls, parsed_response, ns):
         all_tasks_xml = parsed_response.findall(
             './/t:task/t:extractRefresh', namespaces=ns)
 
@@ -1,6 +1,11 @@
 from .endpoint import Endpoint, api
 from .exceptions import MissingRequiredFieldError
 from .. import TaskItem, PaginationItem, RequestFactory
+from ..request_options import RequestOptions
+from multiprocessing.pool import ThreadPool
+import itertools
+import math
+import xml.etree.ElementTree as ET
 import logging
 
 logger = logging.getLogger('tableau.endpoint.tasks')
@@ -15,11 +20,41 @@ class Tasks(Endpoint):
     @api(version='2.6')
     def get(self, req_options=None):
         logger.info('Querying all tasks for the site')
+        return self._get_page(self.baseurl, req_options)
+
+    @api(version='2.6')
+    def get_all(self, page_size=100, max_workers=8):
+        # The first page tells how many tasks there are, the rest of the pages are then fetched concurrently
+        logger.info('Querying all tasks for the site')
+        # Every page shares the same url, so it is only built once
         url = self.baseurl
+        first_page, pagination_item = self._get_page(url, RequestOptions(pagenumber=1, pagesize=page_size))
+        if pagination_item.total_available is None:
+            return first_page
+
+        # Server can return fewer tasks per page than asked for, so count pages by the size it used
+        page_size = pagination_item.page_size
+        page_count = int(math.ceil(pagination_item.total_available / float(page_size)))
+        remaining_pages = list(range(2, page_count + 1))
+        if not remaining_pages:
+            return first_page
+
+        pool = ThreadPool(min(max_workers, len(remaining_pages)))
+        try:
+            other_pages = pool.map(lambda page_number: self._get_page(url, RequestOptions(page_number, page_size))[0],
+                                   remaining_pages)
+        finally:
+            pool.close()
+            pool.join()
+        return list(itertools.chain(first_page, *other_pages))
+
+    def _get_page(self, url, req_options):
         server_response = self.get_request(url, req_options)
 
-        pagination_item = PaginationItem.from_response(server_response.content, self.parent_srv.namespace)
-        all_extract_tasks = TaskItem.from_response(server_response.content, self.parent_srv.namespace)
+        # parse the response once for both the pagination and the tasks
+        parsed_response = ET.fromstring(server_response.content)
+        pagination_item = PaginationItem.from_xml_element(parsed_response, self.parent_srv.namespace)
+        all_extract_tasks = TaskItem.from_xml_element(parsed_response, self.parent_srv.namespace)
         return all_extract_tasks, pagination_item
 
     @api(version='2.6')
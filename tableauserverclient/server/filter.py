@@ -9,10 +9,11 @@ class Filter(object):
         self.value = value
 
     def __str__(self):
-        value_string = str(self._value)
+        # values are formatted as text so names that are not ASCII also work on Python 2
+        value_string = u'{}'.format(self._value)
         if isinstance(self._value, list):
-            value_string = value_string.replace(' ', '').replace('\'', '')
-        return '{0}:{1}:{2}'.format(self.field, self.operator, value_string)
+            value_string = u'[{}]'.format(u','.join(u'{}'.format(value) for value in self._value))
+        return u'{0}:{1}:{2}'.format(self.field, self.operator, value_string)
 
     @property
     def value(self):
@@ -73,11 +73,11 @@ class RequestOptions(RequestOptionsBase):
             ordered_sort_options = sorted(sort_options)
             params.append('sort={}'.format(','.join(ordered_sort_options)))
         if len(self.filter) > 0:
-            filter_options = (str(filter_item) for filter_item in self.filter)
+            filter_options = (u'{}'.format(filter_item) for filter_item in self.filter)
             ordered_filter_options = sorted(filter_options)
-            params.append('filter={}'.format(','.join(ordered_filter_options)))
+            params.append(u'filter={}'.format(u','.join(ordered_filter_options)))
 
-        return "{0}?{1}".format(url, '&'.join(params))
+        return u"{0}?{1}".format(url, '&'.join(params))
 
 
 class _FilterOptionsBase(RequestOptionsBase):
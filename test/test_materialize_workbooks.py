@@ -0,0 +1,162 @@
+import unittest
+import os
+import sys
+import tempfile
+import requests_mock
+import tableauserverclient as TSC
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'samples'))
+import materialize_workbooks  # noqa: E402
+
+TEST_ASSET_DIR = os.path.join(os.path.dirname(__file__), 'assets')
+
+GET_XML = os.path.join(TEST_ASSET_DIR, 'workbook_get.xml')
+GET_EMPTY_XML = os.path.join(TEST_ASSET_DIR, 'workbook_get_empty.xml')
+UPDATE_XML = os.path.join(TEST_ASSET_DIR, 'workbook_update.xml')
+
+DEFAULT_PROJECT_ID = 'ee8c6e70-43b6-11e6-af4f-f7b0d8e20760'
+
+
+class MaterializeWorkbooksTests(unittest.TestCase):
+    def setUp(self):
+        self.server = TSC.Server('http://test')
+
+        # Fake signin
+        self.server._site_id = 'dad65087-b08b-4603-af4e-2887b8aafc67'
+        self.server._auth_token = 'j80k54ll2lfMZ0tv97mlPvvSCRyD0DOM'
+
+        self.baseurl = self.server.workbooks.baseurl
+
+    @staticmethod
+    def _make_projects(*names):
+        all_projects = dict()
+        for index, name in enumerate(names):
+            project = TSC.ProjectItem(name)
+            project._id = DEFAULT_PROJECT_ID if name == 'default' else 'project-{}'.format(index)
+            all_projects[project.id] = project
+        return all_projects
+
+    def test_get_workbooks_by_names_filters_by_name(self):
+        with open(GET_XML, 'rb') as f:
+            response_xml = f.read().decode('utf-8')
+        with requests_mock.mock() as m:
+            m.get(self.baseurl, text=response_xml)
+            workbooks_by_name = materialize_workbooks.get_workbooks_by_names(self.server,
+                                                                             ['Superstore', 'Sales Reports'])
+            query = m.request_history[0].qs
+
+        self.assertEqual(['name:in:[sales reports,superstore]'], query['filter'])
+        self.assertEqual(['Superstore'], list(workbooks_by_name.keys()))
+
+    def test_get_workbooks_by_names_unsafe_name_pages_through_all_workbooks(self):
+        with open(GET_XML, 'rb') as f:
+            response_xml = f.read().decode('utf-8')
+        for unsafe_name in ['Sales & Marketing', 'Q1 #2', 'A+B', 'Sales, Marketing', '100%']:
+            with requests_mock.mock() as m:
+                m.get(self.baseurl, text=response_xml)
+                workbooks_by_name = materialize_workbooks.get_workbooks_by_names(self.server,
+                                                                                 ['Superstore', unsafe_name])
+                query = m.request_history[0].qs
+
+            self.assertNotIn('filter', query)
+            self.assertEqual(['1000'], query['pagesize'])
+            self.assertEqual(['Superstore'], list(workbooks_by_name.keys()))
+
+    def test_get_workbooks_in_projects_filters_by_project_name(self):
+        all_projects = self._make_projects('default', 'Finance')
+        with open(GET_XML, 'rb') as f:
+            response_xml = f.read().decode('utf-8')
+        with requests_mock.mock() as m:
+            m.get(self.baseurl, text=response_xml)
+            workbooks = materialize_workbooks.get_workbooks_in_projects(self.server, all_projects,
+                                                                        set(all_projects.keys()))
+            queries = [request.qs for request in m.request_history]
+
+        self.assertEqual([['projectname:in:[finance,default]']], [query['filter'] for query in queries])
+        self.assertEqual(2, len(workbooks))
+
+    def test_get_workbooks_in_projects_chunks_project_names(self):
+        all_projects = self._make_projects('default', 'Finance')
+        chunk_size = materialize_workbooks.NAME_FILTER_CHUNK_SIZE
+        materialize_workbooks.NAME_FILTER_CHUNK_SIZE = 1
+        try:
+            with open(GET_EMPTY_XML, 'rb') as f:
+                empty_response_xml = f.read().decode('utf-8')
+            with open(GET_XML, 'rb') as f:
+                response_xml = f.read().decode('utf-8')
+            with requests_mock.mock() as m:
+                m.get(self.baseurl, [{'text': empty_response_xml}, {'text': response_xml}])
+                workbooks = materialize_workbooks.get_workbooks_in_projects(self.server, all_projects,
+                                                                            set(all_projects.keys()))
+                queries = [request.qs for request in m.request_history]
+        finally:
+            materialize_workbooks.NAME_FILTER_CHUNK_SIZE = chunk_size
+
+        self.assertEqual([['projectname:in:[finance]'], ['projectname:in:[default]']],
+                         [query['filter'] for query in queries])
+        self.assertEqual(2, len(workbooks))
+
+    def test_get_workbooks_in_projects_unsafe_name_pages_through_all_workbooks(self):
+        all_projects = self._make_projects('default', 'Sales & Marketing')
+        with open(GET_XML, 'rb') as f:
+            response_xml = f.read().decode('utf-8')
+        with requests_mock.mock() as m:
+            m.get(self.baseurl, text=response_xml)
+            workbooks = materialize_workbooks.get_workbooks_in_projects(self.server, all_projects,
+                                                                        set(all_projects.keys()))
+            query = m.request_history[0].qs
+
+        self.assertNotIn('filter', query)
+        self.assertEqual(['1000'], query['pagesize'])
+        self.assertEqual(2, len(workbooks))
+
+    def test_sanitize_workbook_list_reads_names_as_text(self):
+        workbook_list = tempfile.NamedTemporaryFile(suffix='.txt', delete=False)
+        workbook_list.write(u'Superstore\n\nVentes r\xe9gion  \n'.encode('utf-8'))
+        workbook_list.close()
+        try:
+            workbook_names = materialize_workbooks.sanitize_workbook_list(workbook_list.name)
+        finally:
+            os.remove(workbook_list.name)
+
+        self.assertEqual([u'Superstore', u'Ventes r\xe9gion'], workbook_names)
+
+    def test_update_workbooks_keeps_going_after_failed_updates(self):
+        workbooks = []
+        for workbook_id in ['1f951daf-4061-451a-9df1-69a8062664f2', 'c7a9327e-1cda-4504-b026-ddb43b976d1d']:
+            workbook = TSC.WorkbookItem('1d0304cd-3796-429f-b815-7258370b9b74')
+            workbook._id = workbook_id
+            workbook.name = 'renamedWorkbook'
+            workbooks.append(workbook)
+        materialized_views_config = {'materialized_views_enabled': True, 'run_materialization_now': False}
+        with open(UPDATE_XML, 'rb') as f:
+            response_xml = f.read().decode('utf-8')
+        with requests_mock.mock() as m:
+            m.put(self.baseurl + '/1f951daf-4061-451a-9df1-69a8062664f2', text=response_xml)
+            m.put(self.baseurl + '/c7a9327e-1cda-4504-b026-ddb43b976d1d', status_code=500, text='Internal error')
+            updated_workbooks = materialize_workbooks.update_workbooks(self.server, workbooks,
+                                                                       materialized_views_config)
+
+        self.assertEqual([workbooks[0]], updated_workbooks)
+
+    def test_update_workbooks_by_names_updates_repeated_names_once(self):
+        workbook_list = tempfile.NamedTemporaryFile(suffix='.txt', delete=False)
+        workbook_list.write(b'Superstore\nSuperstore\n')
+        workbook_list.close()
+        materialized_views_config = {'materialized_views_enabled': True, 'run_materialization_now': False}
+        with open(GET_XML, 'rb') as f:
+            get_xml = f.read().decode('utf-8')
+        with open(UPDATE_XML, 'rb') as f:
+            update_xml = f.read().decode('utf-8')
+        try:
+            with requests_mock.mock() as m:
+                m.get(self.baseurl, text=get_xml)
+                m.put(self.baseurl + '/6d13b0ca-043d-4d42-8c9d-3f3313ea3a00', text=update_xml)
+                materialize_workbooks.update_workbooks_by_names(workbook_list.name, self.server,
+                                                                materialized_views_config)
+                requests = m.request_history
+        finally:
+            os.remove(workbook_list.name)
+
+        self.assertEqual(['name:in:[superstore]'], requests[0].qs['filter'])
+        self.assertEqual(['PUT'], [request.method for request in requests[1:]])
@@ -59,6 +59,23 @@ class SortTests(unittest.TestCase):
                                                        content_type='text/xml')
             self.assertEqual(resp.request.query, 'pagenumber=13&pagesize=13&filter=tags:in:[stocks,market]')
 
+    def test_filter_in_keeps_spaces_in_values(self):
+        filter_in = TSC.Filter(TSC.RequestOptions.Field.ProjectName,
+                               TSC.RequestOptions.Operator.In,
+                               ['Sales Reports', 'Finance'])
+        self.assertEqual('projectName:in:[Sales Reports,Finance]', str(filter_in))
+
+    def test_filter_in_formats_non_ascii_values_as_text(self):
+        filter_in = TSC.Filter(TSC.RequestOptions.Field.ProjectName,
+                               TSC.RequestOptions.Operator.In,
+                               [u'Ventes r\xe9gion', u'Finance'])
+        self.assertEqual(u'projectName:in:[Ventes r\xe9gion,Finance]', u'{}'.format(filter_in))
+
+        opts = TSC.RequestOptions()
+        opts.filter.add(filter_in)
+        url = opts.apply_query_params('http://test/api/2.3/sites/dad65087-b08b-4603-af4e-2887b8aafc67/workbooks')
+        self.assertTrue(url.endswith(u'filter=projectName:in:[Ventes r\xe9gion,Finance]'))
+
     def test_sort_asc(self):
         with requests_mock.mock() as m:
             m.get(requests_mock.ANY)
@@ -9,6 +9,9 @@ GET_XML_NO_WORKBOOK = os.path.join(TEST_ASSET_DIR, "tasks_no_workbook_or_datasou
 GET_XML_WITH_WORKBOOK = os.path.join(TEST_ASSET_DIR, "tasks_with_workbook.xml")
 GET_XML_WITH_DATASOURCE = os.path.join(TEST_ASSET_DIR, "tasks_with_datasource.xml")
 GET_XML_WITH_WORKBOOK_AND_DATASOURCE = os.path.join(TEST_ASSET_DIR, "tasks_with_workbook_and_datasource.xml")
+GET_XML_PAGE_1 = os.path.join(TEST_ASSET_DIR, "tasks_page_1.xml")
+GET_XML_PAGE_2 = os.path.join(TEST_ASSET_DIR, "tasks_page_2.xml")
+GET_XML_PAGE_3 = os.path.join(TEST_ASSET_DIR, "tasks_page_3.xml")
 
 
 class TaskTests(unittest.TestCase):
@@ -76,3 +79,30 @@ class TaskTests(unittest.TestCase):
         self.assertEqual('c7a9327e-1cda-4504-b026-ddb43b976d1d', task.target.id)
         self.assertEqual('workbook', task.target.type)
         self.assertEqual('b60b4efd-a6f7-4599-beb3-cb677e7abac1', task.schedule_id)
+
+    def test_get_all(self):
+        with open(GET_XML_PAGE_1, "rb") as f:
+            page_1 = f.read().decode("utf-8")
+        with open(GET_XML_PAGE_2, "rb") as f:
+            page_2 = f.read().decode("utf-8")
+        with open(GET_XML_PAGE_3, "rb") as f:
+            page_3 = f.read().decode("utf-8")
+        with requests_mock.mock() as m:
+            m.get(self.baseurl + "?pageNumber=1&pageSize=2", text=page_1)
+            m.get(self.baseurl + "?pageNumber=2&pageSize=2", text=page_2)
+            m.get(self.baseurl + "?pageNumber=3&pageSize=2", text=page_3)
+            all_tasks = self.server.tasks.get_all(page_size=2)
+
+        self.assertEqual(5, len(all_tasks))
+        self.assertEqual('e167d593-7853-4b83-85c8-c2c73db227ab', all_tasks[0].id)
+        self.assertEqual('736eaed8-8e12-40ab-a35b-d79a3e20fad6', all_tasks[2].id)
+        self.assertEqual('8d853ea3-8e34-46d6-acd0-dbc1a5c14d14', all_tasks[4].id)
+
+    def test_get_all_without_pagination(self):
+        with open(GET_XML_WITH_WORKBOOK_AND_DATASOURCE, "rb") as f:
+            response_xml = f.read().decode("utf-8")
+        with requests_mock.mock() as m:
+            m.get(self.baseurl, text=response_xml)
+            all_tasks = self.server.tasks.get_all()
+
+        self.assertEqual(3, len(all_tasks))